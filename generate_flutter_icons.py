@@ -20,22 +20,153 @@ Usage:
     python generate_flutter_icons.py master_icon.svg /path/to/flutter_project
 
 PNG input is resized with Pillow (LANCZOS). SVG input requires pyvips
-(pip install pyvips) and each icon is rasterized directly from the vector
-at its exact target size for maximum sharpness.
+(pip install pyvips); it is rasterized once at the largest icon size (1024px) and
+downsampled like a PNG, or with --svg-exact each icon is rasterized directly
+from the vector at its exact target size.
 
 The flutter_project path should be the root (with android/, ios/, linux/, macos/, web/, windows/ folders).
 """
 
+from __future__ import annotations
+
 import argparse
 import io
 import os
+import struct
+import time
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
 
-from PIL import Image
+# Pillow, and the heavier standard-library modules only used while generating
+# (concurrent.futures, hashlib, json), are imported inside the functions that
+# need them, so --help and argument errors return without paying their import cost.
 
 
 # ------------ CONFIG: output sizes & paths -----------------
 
+# Each platform's targets are fixed, so they are spelled out once at import time
+# as (path relative to the project root, pixel size) pairs. The get_*_icons()
+# functions only join each relative path onto the project root.
+
+_ANDROID_RES_DIR = "android/app/src/main/res"
+_ANDROID_DENSITIES = {
+    "mipmap-mdpi": 1,
+    "mipmap-hdpi": 1.5,
+    "mipmap-xhdpi": 2,
+    "mipmap-xxhdpi": 3,
+    "mipmap-xxxhdpi": 4,
+}
+_ANDROID_ICONS = tuple(
+    entry
+    for folder, scale in _ANDROID_DENSITIES.items()
+    for entry in (
+        # Standard launcher icon: 48dp
+        (f"{_ANDROID_RES_DIR}/{folder}/ic_launcher.png", int(48 * scale)),
+        # Round launcher icon: 48dp (same size, used by launchers that show round icons)
+        (f"{_ANDROID_RES_DIR}/{folder}/ic_launcher_round.png", int(48 * scale)),
+        # Adaptive foreground layer: 108dp (provides bleed area for masking)
+        (f"{_ANDROID_RES_DIR}/{folder}/ic_launcher_foreground.png", int(108 * scale)),
+    )
+)
+
+_IOS_APPICON_DIR = "ios/Runner/Assets.xcassets/AppIcon.appiconset"
+_IOS_ICONS = (
+    # iPhone & iPad notification / settings / spotlight / app icons
+    (f"{_IOS_APPICON_DIR}/Icon-App-20x20@1x.png", 20),
+    (f"{_IOS_APPICON_DIR}/Icon-App-20x20@2x.png", 40),
+    (f"{_IOS_APPICON_DIR}/Icon-App-20x20@3x.png", 60),
+
+    (f"{_IOS_APPICON_DIR}/Icon-App-29x29@1x.png", 29),
+    (f"{_IOS_APPICON_DIR}/Icon-App-29x29@2x.png", 58),
+    (f"{_IOS_APPICON_DIR}/Icon-App-29x29@3x.png", 87),
+
+    (f"{_IOS_APPICON_DIR}/Icon-App-40x40@1x.png", 40),
+    (f"{_IOS_APPICON_DIR}/Icon-App-40x40@2x.png", 80),
+    (f"{_IOS_APPICON_DIR}/Icon-App-40x40@3x.png", 120),
+
+    (f"{_IOS_APPICON_DIR}/Icon-App-60x60@2x.png", 120),
+    (f"{_IOS_APPICON_DIR}/Icon-App-60x60@3x.png", 180),
+
+    (f"{_IOS_APPICON_DIR}/Icon-App-76x76@1x.png", 76),
+    (f"{_IOS_APPICON_DIR}/Icon-App-76x76@2x.png", 152),
+    (f"{_IOS_APPICON_DIR}/Icon-App-83.5x83.5@2x.png", 167),
+
+    # App Store / marketing icon
+    (f"{_IOS_APPICON_DIR}/Icon-App-1024x1024@1x.png", 1024),
+)
+
+_MACOS_APPICON_DIR = "macos/Runner/Assets.xcassets/AppIcon.appiconset"
+_MACOS_ICONS = tuple(
+    (f"{_MACOS_APPICON_DIR}/app_icon_{size}.png", size)
+    for size in (16, 32, 64, 128, 256, 512, 1024)
+)
+
+_LINUX_ICONS = (
+    ("linux/flutter/app_icon.png", 256),
+)
+
+_WEB_ICONS = (
+    ("web/favicon.png", 32),
+    ("web/icons/Icon-192.png", 192),
+    ("web/icons/Icon-512.png", 512),
+    ("web/icons/Icon-maskable-192.png", 192),
+    ("web/icons/Icon-maskable-512.png", 512),
+)
+
+_STORE_ICONS = (
+    ("appstore.png", 1024),
+    ("playstore.png", 512),
+)
+
+_IOS_LEGACY_ICONS = (
+    (f"{_IOS_APPICON_DIR}/Icon-App-57x57@1x.png", 57),
+    (f"{_IOS_APPICON_DIR}/Icon-App-57x57@2x.png", 114),
+
+    (f"{_IOS_APPICON_DIR}/Icon-App-50x50@1x.png", 50),
+    (f"{_IOS_APPICON_DIR}/Icon-App-50x50@2x.png", 100),
+
+    (f"{_IOS_APPICON_DIR}/Icon-App-72x72@1x.png", 72),
+    (f"{_IOS_APPICON_DIR}/Icon-App-72x72@2x.png", 144),
+)
+
+_WATCH_ICONS = (
+    # Notification center
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-24x24@2x.png", 48),     # 38mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-27.5x27.5@2x.png", 55), # 42mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-33x33@2x.png", 66),     # 45mm
+
+    # App launcher
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-40x40@2x.png", 80),     # 38mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-44x44@2x.png", 88),     # 40mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-46x46@2x.png", 92),     # 41mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-50x50@2x.png", 100),    # 44mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-51x51@2x.png", 102),    # 45mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-54x54@2x.png", 108),    # 49mm
+
+    # Quick look
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-86x86@2x.png", 172),    # 38mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-98x98@2x.png", 196),    # 42mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-108x108@2x.png", 216),  # 44mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-117x117@2x.png", 234),  # 45mm
+    (f"{_IOS_APPICON_DIR}/Icon-Watch-129x129@2x.png", 258),  # 49mm
+)
+
+_WINDOWS_ICO = "windows/runner/resources/app_icon.ico"
+_WINDOWS_ICO_SIZES = (16, 20, 24, 30, 32, 36, 40, 48, 60, 64, 72, 80, 96, 256)
+
+_MSIX_ICONS = (
+    ("windows/runner/resources/msix_icon.png", 512),
+)
+
+
+def _join_targets(base: Path, spec):
+    """Build an output path -> pixel size mapping from a (relative path, size) spec."""
+    return {base / rel: size for rel, size in spec}
+
 
 def get_android_icons(base: Path):
     """Return mapping of output path -> pixel size for Android launcher icons.
@@ -45,23 +176,7 @@ def get_android_icons(base: Path):
     (Android 8.0+); it should be 108dp (1.5x the 72dp visible area) to allow
     the launcher to mask and animate correctly.
     """
-    res_base = base / "android" / "app" / "src" / "main" / "res"
-    densities = {
-        "mipmap-mdpi": 1,
-        "mipmap-hdpi": 1.5,
-        "mipmap-xhdpi": 2,
-        "mipmap-xxhdpi": 3,
-        "mipmap-xxxhdpi": 4,
-    }
-    targets = {}
-    for folder, scale in densities.items():
-        # Standard launcher icon: 48dp
-        targets[res_base / folder / "ic_launcher.png"] = int(48 * scale)
-        # Round launcher icon: 48dp (same size, used by launchers that show round icons)
-        targets[res_base / folder / "ic_launcher_round.png"] = int(48 * scale)
-        # Adaptive foreground layer: 108dp (provides bleed area for masking)
-        targets[res_base / folder / "ic_launcher_foreground.png"] = int(108 * scale)
-    return targets
+    return _join_targets(base, _ANDROID_ICONS)
 
 
 IOS_PLATFORM = "ios"
@@ -73,31 +188,7 @@ def get_ios_icons(base: Path):
     These filenames match the typical Xcode / Flutter Runner template.
     Apple requires iOS icons to have no alpha channel / transparency.
     """
-    appicon_dir = base / "ios" / "Runner" / "Assets.xcassets" / "AppIcon.appiconset"
-    return {
-        # iPhone & iPad notification / settings / spotlight / app icons
-        appicon_dir / "Icon-App-20x20@1x.png": 20,
-        appicon_dir / "Icon-App-20x20@2x.png": 40,
-        appicon_dir / "Icon-App-20x20@3x.png": 60,
-
-        appicon_dir / "Icon-App-29x29@1x.png": 29,
-        appicon_dir / "Icon-App-29x29@2x.png": 58,
-        appicon_dir / "Icon-App-29x29@3x.png": 87,
-
-        appicon_dir / "Icon-App-40x40@1x.png": 40,
-        appicon_dir / "Icon-App-40x40@2x.png": 80,
-        appicon_dir / "Icon-App-40x40@3x.png": 120,
-
-        appicon_dir / "Icon-App-60x60@2x.png": 120,
-        appicon_dir / "Icon-App-60x60@3x.png": 180,
-
-        appicon_dir / "Icon-App-76x76@1x.png": 76,
-        appicon_dir / "Icon-App-76x76@2x.png": 152,
-        appicon_dir / "Icon-App-83.5x83.5@2x.png": 167,
-
-        # App Store / marketing icon
-        appicon_dir / "Icon-App-1024x1024@1x.png": 1024,
-    }
+    return _join_targets(base, _IOS_ICONS)
 
 
 def get_macos_icons(base: Path):
@@ -107,36 +198,17 @@ def get_macos_icons(base: Path):
     Shared files (e.g. app_icon_32.png serves both 16@2x and 32@1x) are handled
     by Contents.json; we just need one file per unique pixel size.
     """
-    appicon_dir = base / "macos" / "Runner" / "Assets.xcassets" / "AppIcon.appiconset"
-    return {
-        appicon_dir / "app_icon_16.png": 16,
-        appicon_dir / "app_icon_32.png": 32,
-        appicon_dir / "app_icon_64.png": 64,
-        appicon_dir / "app_icon_128.png": 128,
-        appicon_dir / "app_icon_256.png": 256,
-        appicon_dir / "app_icon_512.png": 512,
-        appicon_dir / "app_icon_1024.png": 1024,
-    }
+    return _join_targets(base, _MACOS_ICONS)
 
 
 def get_linux_icons(base: Path):
     """Return mapping of output path -> pixel size for Linux desktop icon."""
-    return {
-        base / "linux" / "flutter" / "app_icon.png": 256,
-    }
+    return _join_targets(base, _LINUX_ICONS)
 
 
 def get_web_icons(base: Path):
     """Return mapping of output path -> pixel size for web favicon and PWA icons."""
-    web_dir = base / "web"
-    icons_dir = web_dir / "icons"
-    return {
-        web_dir / "favicon.png": 32,
-        icons_dir / "Icon-192.png": 192,
-        icons_dir / "Icon-512.png": 512,
-        icons_dir / "Icon-maskable-192.png": 192,
-        icons_dir / "Icon-maskable-512.png": 512,
-    }
+    return _join_targets(base, _WEB_ICONS)
 
 
 def get_store_icons(base: Path):
@@ -145,10 +217,7 @@ def get_store_icons(base: Path):
     appstore.png  — 1024x1024 (Apple App Store marketing icon)
     playstore.png — 512x512   (Google Play Store listing icon)
     """
-    return {
-        base / "appstore.png": 1024,
-        base / "playstore.png": 512,
-    }
+    return _join_targets(base, _STORE_ICONS)
 
 
 def get_ios_legacy_icons(base: Path):
@@ -160,17 +229,7 @@ def get_ios_legacy_icons(base: Path):
       50x50 @1x/@2x (legacy iPad Spotlight)
       72x72 @1x/@2x (legacy iPad app icon)
     """
-    appicon_dir = base / "ios" / "Runner" / "Assets.xcassets" / "AppIcon.appiconset"
-    return {
-        appicon_dir / "Icon-App-57x57@1x.png": 57,
-        appicon_dir / "Icon-App-57x57@2x.png": 114,
-
-        appicon_dir / "Icon-App-50x50@1x.png": 50,
-        appicon_dir / "Icon-App-50x50@2x.png": 100,
-
-        appicon_dir / "Icon-App-72x72@1x.png": 72,
-        appicon_dir / "Icon-App-72x72@2x.png": 144,
-    }
+    return _join_targets(base, _IOS_LEGACY_ICONS)
 
 
 def get_watch_icons(base: Path):
@@ -180,28 +239,7 @@ def get_watch_icons(base: Path):
     and quick look roles. Companion settings icons (58px, 87px) are not
     included here as they are shared with the standard iOS icon set.
     """
-    appicon_dir = base / "ios" / "Runner" / "Assets.xcassets" / "AppIcon.appiconset"
-    return {
-        # Notification center
-        appicon_dir / "Icon-Watch-24x24@2x.png": 48,     # 38mm
-        appicon_dir / "Icon-Watch-27.5x27.5@2x.png": 55, # 42mm
-        appicon_dir / "Icon-Watch-33x33@2x.png": 66,     # 45mm
-
-        # App launcher
-        appicon_dir / "Icon-Watch-40x40@2x.png": 80,     # 38mm
-        appicon_dir / "Icon-Watch-44x44@2x.png": 88,     # 40mm
-        appicon_dir / "Icon-Watch-46x46@2x.png": 92,     # 41mm
-        appicon_dir / "Icon-Watch-50x50@2x.png": 100,    # 44mm
-        appicon_dir / "Icon-Watch-51x51@2x.png": 102,    # 45mm
-        appicon_dir / "Icon-Watch-54x54@2x.png": 108,    # 49mm
-
-        # Quick look
-        appicon_dir / "Icon-Watch-86x86@2x.png": 172,    # 38mm
-        appicon_dir / "Icon-Watch-98x98@2x.png": 196,    # 42mm
-        appicon_dir / "Icon-Watch-108x108@2x.png": 216,  # 44mm
-        appicon_dir / "Icon-Watch-117x117@2x.png": 234,  # 45mm
-        appicon_dir / "Icon-Watch-129x129@2x.png": 258,  # 49mm
-    }
+    return _join_targets(base, _WATCH_ICONS)
 
 
 def get_windows_ico_path_and_sizes(base: Path):
@@ -215,9 +253,7 @@ def get_windows_ico_path_and_sizes(base: Path):
       Context/menu/tray, taskbar, Start pins → combined unique list:
       16, 20, 24, 30, 32, 36, 40, 48, 60, 64, 72, 80, 96, 256
     """
-    ico_path = base / "windows" / "runner" / "resources" / "app_icon.ico"
-    windows_sizes = [16, 20, 24, 30, 32, 36, 40, 48, 60, 64, 72, 80, 96, 256]
-    return ico_path, windows_sizes
+    return base / _WINDOWS_ICO, list(_WINDOWS_ICO_SIZES)
 
 
 def get_msix_icons(base: Path):
@@ -232,9 +268,7 @@ def get_msix_icons(base: Path):
     to downscale cleanly to all required sizes (max generated: 600x600
     for Square150x150Logo.scale-400).
     """
-    return {
-        base / "windows" / "runner" / "resources" / "msix_icon.png": 512,
-    }
+    return _join_targets(base, _MSIX_ICONS)
 
 
 # ------------ platform registry -----------------
@@ -260,9 +294,36 @@ OPTIONAL_PLATFORMS = ["ios-legacy", "watch"]
 
 ALL_PLATFORMS = DEFAULT_PLATFORMS + OPTIONAL_PLATFORMS
 
+# Largest icon any platform generates (App Store / marketing icons). The master
+# is decoded at, and fitted to, this size rather than the largest selected one,
+# so an icon's bytes do not depend on which other platforms are requested.
+MAX_ICON_SIZE = 1024
+
 
 # ------------ SVG rasterization -----------------
 
+# pyvips module once loaded by _require_pyvips (optional dependency, SVG input only)
+_pyvips = None
+
+
+def _require_pyvips():
+    """Import pyvips on first use and return it, raising a helpful error if it is missing.
+
+    The import is deferred rather than done at module load so PNG-only runs and
+    --help never pay its ~30 ms library load; later calls return the bound module.
+    """
+    global _pyvips
+    if _pyvips is None:
+        try:
+            import pyvips
+        except ImportError:
+            raise RuntimeError(
+                "SVG input requires pyvips. Install it with:\n"
+                "  pip install pyvips"
+            )
+        _pyvips = pyvips
+    return _pyvips
+
 
 def _svg_to_pil(svg_path: Path, size: int) -> Image.Image:
     """Rasterize an SVG to a Pillow RGBA image at the given size using pyvips.
@@ -270,10 +331,23 @@ def _svg_to_pil(svg_path: Path, size: int) -> Image.Image:
     The SVG is fitted within a size x size box (preserving aspect ratio),
     then centered on a transparent square canvas if the SVG is not square.
     """
-    import pyvips
+    from PIL import Image
+
+    pyvips = _require_pyvips()
     image = pyvips.Image.thumbnail(str(svg_path), size, height=size)
-    png_data = image.write_to_buffer(".png")
-    rendered = Image.open(io.BytesIO(png_data)).convert("RGBA")
+
+    # Hand the raw pixels straight to Pillow rather than round-tripping through
+    # a PNG encode/decode. librsvg output is already 8-bit sRGB with alpha;
+    # normalise anyway so the buffer is guaranteed to be packed RGBA.
+    if image.interpretation != "srgb":
+        image = image.colourspace("srgb")
+    if not image.hasalpha():
+        image = image.addalpha()
+    if image.format != "uchar":
+        image = image.cast("uchar")
+    rendered = Image.frombuffer(
+        "RGBA", (image.width, image.height), image.write_to_memory(), "raw", "RGBA", 0, 1
+    )
 
     # Pad to exact square if the SVG viewBox wasn't square
     if rendered.size != (size, size):
@@ -284,36 +358,426 @@ def _svg_to_pil(svg_path: Path, size: int) -> Image.Image:
     return rendered
 
 
+def _fit_master(img: Image.Image) -> Image.Image:
+    """Downsample a master larger than every icon to exactly MAX_ICON_SIZE.
+
+    Power-of-two multiples (e.g. 4096 -> 1024) use a box-average Image.reduce;
+    other sizes get one LANCZOS pass. Every later resize, including the workers'
+    pyramids, then starts from this smaller image, and its levels line up with
+    the mostly power-of-two target sizes. The fitted size is fixed rather than
+    the largest selected target, so an icon's bytes do not depend on which other
+    platforms are requested.
+    """
+    from PIL import Image
+
+    factor, remainder = divmod(img.width, MAX_ICON_SIZE)
+    if remainder == 0 and factor & (factor - 1) == 0:
+        return img.reduce(factor)
+    return img.resize((MAX_ICON_SIZE, MAX_ICON_SIZE), Image.LANCZOS)
+
+
+# Smallest icon any platform generates. The pyramid always reaches down to it,
+# not to the smallest selected size, so its levels (and every icon resized from
+# them) are the same whichever platforms are requested.
+PYRAMID_MIN_SIZE = 16
+
+
+def _build_pyramid(img: Image.Image):
+    """Return successive 2x box-average downsamples of img, stopping near PYRAMID_MIN_SIZE.
+
+    Each level halves the previous one with Image.reduce (an integer-factor box
+    filter, much cheaper than a convolution), so small targets can be
+    LANCZOS-resized from a nearby level instead of the full-resolution master.
+    """
+    levels = [img]
+    while levels[-1].width > 2 * PYRAMID_MIN_SIZE:
+        levels.append(levels[-1].reduce(2))
+    return levels
+
+
+def _resize_from_pyramid(levels, size: int) -> Image.Image:
+    """Resize to size x size from the smallest pyramid level still >= size.
+
+    A level that already has the target size (e.g. 256 from a 1024 master) is
+    used as-is; anything else is LANCZOS-resized from the chosen level. When no
+    level is large enough (a master smaller than the target), the upscale starts
+    from the master itself, never from a reduced level.
+    """
+    from PIL import Image
+
+    large_enough = [level for level in levels if level.width >= size]
+    src = min(large_enough, key=lambda level: level.width) if large_enough else levels[0]
+    if src.width == size:
+        return src
+    return src.resize((size, size), Image.LANCZOS)
+
+
+# Icons up to this size are saved with fast zlib compression; larger ones keep Pillow's default
+FAST_PNG_MAX_SIZE = 512
+
+
+def _png_compress_level(size: int, override=None) -> int:
+    """Return the zlib level for a PNG of the given size.
+
+    Small icons are only a few KB, so level 6 deflate buys almost nothing over
+    level 1 while costing several times the encode time. An explicit override
+    (--png-compress-level) applies to every size.
+    """
+    if override is not None:
+        return override
+    return 1 if size <= FAST_PNG_MAX_SIZE else 6
+
+
+# Icons up to this size skip Pillow's encoder in favour of _encode_png_simple
+SIMPLE_PNG_MAX_SIZE = 128
+
+# PNG colour type per Pillow mode handled by _encode_png_simple
+_PNG_COLOR_TYPES = {"RGB": 2, "RGBA": 6}
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def _encode_png_simple(img: Image.Image, compress_level: int) -> bytes:
+    """Encode an 8-bit RGB/RGBA image as PNG using filter type 0 on every scanline.
+
+    Pillow tries several scanline filters per row; for tiny icons that search
+    costs more than it saves, so this writes unfiltered rows straight to zlib.
+    """
+    width, height = img.size
+    raw = img.tobytes()
+    stride = width * len(img.mode)
+    scanlines = b"".join(b"\x00" + raw[y * stride:(y + 1) * stride] for y in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, _PNG_COLOR_TYPES[img.mode], 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(scanlines, compress_level))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def _encode_png(img: Image.Image, size: int, compress_level=None) -> bytes:
+    """Return PNG bytes for a rendered icon, choosing the cheapest suitable encoder.
+
+    Images carrying an ICC profile always go through Pillow, which writes it as
+    an iCCP chunk, so small and large icons from the same master match in colour.
+    """
+    level = _png_compress_level(size, compress_level)
+    if (
+        size <= SIMPLE_PNG_MAX_SIZE
+        and img.mode in _PNG_COLOR_TYPES
+        and "icc_profile" not in img.info
+    ):
+        return _encode_png_simple(img, level)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=level)
+    return buf.getvalue()
+
+
 def _strip_alpha(img: Image.Image) -> Image.Image:
     """Composite an RGBA image onto a white background, returning an RGB image."""
+    from PIL import Image
+
+    if img.mode != "RGBA":
+        return img.convert("RGB")
     opaque = Image.new("RGB", img.size, (255, 255, 255))
-    opaque.paste(img, mask=img.split()[3])
+    opaque.paste(img, mask=img.getchannel("A"))
     return opaque
 
 
+# ------------ parallel rendering -----------------
+
+# Render source of a pool worker process, set up once by _init_renderer
+_renderer = {}
+
+
+def _make_renderer(img, svg_path, compress_level, write_files):
+    """Return the render source shared by every job of one run.
+
+    PNG masters get their downsample pyramid built here so it is never pickled
+    per job; SVG masters are rasterized per size from svg_path. When write_files
+    is false (--tar-output), encoded PNGs are returned instead of written.
+    """
+    return {
+        "svg_path": svg_path,
+        "compress_level": compress_level,
+        "write_files": write_files,
+        "pyramid": None if img is None else _build_pyramid(img),
+    }
+
+
+def _init_renderer(*args):
+    """Process-pool initializer: build this worker's render source once."""
+    _renderer.update(_make_renderer(*args))
+
+
+def _render_in_worker(job):
+    """Process-pool entry point: render job from the worker's own render source."""
+    return _render_one(_renderer, job)
+
+
+def _render_one(renderer, job):
+    """Render one unique size, encode it once per alpha treatment and write its files.
+
+    renderer is the render source from _make_renderer. job is
+    (size, outputs, keep_frame), where outputs is a list of
+    (out_path, strip_alpha) pairs. Encoding and writing happen in the worker so
+    only the small ICO frame, if any, travels back to the parent process.
+    Returns (size, frame, encoded): frame is the same render as RGBA when
+    keep_frame is set, so ICO packing reuses it instead of resizing again, else
+    None; encoded maps strip_alpha -> PNG bytes when files are not written here,
+    else None.
+    """
+    size, outputs, keep_frame = job
+    if renderer["svg_path"] is not None:
+        resized = _svg_to_pil(renderer["svg_path"], size)
+    else:
+        resized = _resize_from_pyramid(renderer["pyramid"], size)
+
+    encoded = {}
+    for out_path, strip in outputs:
+        if strip not in encoded:
+            # Apple icons must not contain an alpha channel (Apple rejects them);
+            # everything else stays 32-bit RGBA even when an opaque master was
+            # resampled as RGB (Google Play requires alpha on the 512px icon)
+            if strip:
+                out = _strip_alpha(resized)
+            else:
+                out = resized if resized.mode == "RGBA" else resized.convert("RGBA")
+            encoded[strip] = _encode_png(out, size, renderer["compress_level"])
+        if renderer["write_files"]:
+            out_path.write_bytes(encoded[strip])
+
+    frame = None
+    if keep_frame:
+        # ICO frames carry an alpha mask, so opaque (RGB) renders are converted back
+        frame = resized if resized.mode == "RGBA" else resized.convert("RGBA")
+    return size, frame, None if renderer["write_files"] else encoded
+
+
+def _run_render_jobs(
+    img, svg_path, jobs, workers, compress_level=None, write_files=True, use_processes=False
+):
+    """Yield _render_one results in job order, in parallel when workers > 1.
+
+    Threads are the default: Pillow releases the GIL while resampling and
+    compressing, and threads share one pyramid with no pickling or process
+    startup. That render source is local to this call, so nothing outlives it or
+    is shared with an overlapping call. use_processes switches to a process
+    pool, with each worker building its own render source through the initializer.
+
+    Jobs are submitted largest size first so the expensive renders start
+    immediately and the cheap ones fill in around them, instead of the biggest
+    sizes queueing up at the end of the run.
+    """
+    initargs = (img, svg_path, compress_level, write_files)
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(partial(_render_one, _make_renderer(*initargs)), jobs)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    max_workers = min(workers, len(jobs))
+    if use_processes:
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_renderer, initargs=initargs
+        )
+        render = _render_in_worker
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        render = partial(_render_one, _make_renderer(*initargs))
+
+    with executor:
+        futures = {}
+        for job in sorted(jobs, key=lambda job: job[0], reverse=True):
+            futures[job[0]] = executor.submit(render, job)
+        for job in jobs:
+            yield futures[job[0]].result()
+
+
+# ------------ output cache -----------------
+
+# Sidecar file (in the project root) recording which outputs are already up to date
+CACHE_FILENAME = ".icon_cache.json"
+
+# Bump when a change to this script alters the bytes produced for the same inputs
+CACHE_VERSION = 1
+
+
+def _hash_file(path: Path) -> str:
+    """Return a short BLAKE2b digest of a file's contents."""
+    import hashlib
+
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def _load_cache(cache_path: Path):
+    """Load cache entries (relative path -> entry), or an empty dict if missing/invalid."""
+    import json
+
+    try:
+        data = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def _save_cache(cache_path: Path, entries):
+    """Write cache entries atomically so an interrupted run never leaves a corrupt file."""
+    import json
+
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    tmp_path.write_text(json.dumps({"version": CACHE_VERSION, "entries": entries}, indent=1, sort_keys=True))
+    os.replace(tmp_path, cache_path)
+
+
+def _is_cached(entries, rel: str, out_path: Path, key) -> bool:
+    """True if out_path still holds exactly what we last wrote there for the same key.
+
+    An unchanged mtime is trusted as-is. Otherwise (e.g. after a git checkout
+    restored the file) the contents are hashed and compared with what we wrote.
+    """
+    entry = entries.get(rel)
+    if not entry or entry.get("key") != key:
+        return False
+    try:
+        mtime_ns = out_path.stat().st_mtime_ns
+        if mtime_ns == entry.get("mtime_ns"):
+            return True
+        if _hash_file(out_path) != entry.get("digest"):
+            return False
+    except OSError:
+        return False
+    entry["mtime_ns"] = mtime_ns
+    return True
+
+
+def _record_cache(entries, rel: str, out_path: Path, key):
+    """Remember that out_path was just written for key, along with its content digest."""
+    entries[rel] = {"key": key, "mtime_ns": out_path.stat().st_mtime_ns, "digest": _hash_file(out_path)}
+
+
 # ------------ core logic -----------------
 
 
-def generate_icons(master_path: Path, project_root: Path, platforms=None):
+@contextmanager
+def _open_tar_output(tar_output):
+    """Yield a tarfile for tar_output, or None when icons are written into the project.
+
+    The archive is built under a temporary name next to tar_output and moved into
+    place only once it is complete, so a failed run never leaves a truncated
+    tarball at the requested path (or a stray temporary one beside it).
+    """
+    if tar_output is None:
+        yield None
+        return
+
+    import tarfile
+
+    tar_output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = tar_output.with_name(tar_output.name + ".tmp")
+    try:
+        with tarfile.open(tmp_path, "w") as tar:
+            yield tar
+        os.replace(tmp_path, tar_output)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _add_to_tar(tar, rel: str, data: bytes):
+    """Append data to an open tarfile as a regular file at the project-relative path rel."""
+    import tarfile
+
+    info = tarfile.TarInfo(name=rel)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _relative_to(path: Path, root: Path) -> str:
+    """Return path relative to root as a forward-slash string, computed once per output.
+
+    Used for log lines, cache entries and tar member names alike, so all three
+    read the same on every OS.
+    """
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return Path(os.path.relpath(path, root)).as_posix()
+
+
+def generate_icons(
+    master_path: Path,
+    project_root: Path,
+    platforms=None,
+    workers=None,
+    use_cache=True,
+    quiet=False,
+    svg_exact=False,
+    png_compress_level=None,
+    tar_output=None,
+    ico_bitmap_format="png",
+    use_processes=False,
+):
+    from PIL import Image
+
     if not master_path.is_file():
         raise FileNotFoundError(f"Master icon not found: {master_path}")
 
     is_svg = master_path.suffix.lower() == ".svg"
 
+    if platforms is None:
+        platforms = DEFAULT_PLATFORMS
+
+    # Platforms whose icons must have no alpha channel (Apple rejects transparency)
+    apple_icon_platforms = {IOS_PLATFORM, "ios-legacy", "watch"}
+
+    # Flatten the selected platforms into (out_path, size, strip_alpha) targets,
+    # sorted by size. A path requested by more than one platform keeps the last
+    # platform's settings.
+    flattened = {
+        out_path: (out_path, size, platform in apple_icon_platforms)
+        for platform in platforms
+        if platform in PLATFORM_GENERATORS
+        for out_path, size in PLATFORM_GENERATORS[platform](project_root).items()
+    }
+    targets = sorted(flattened.values(), key=itemgetter(1))
+
+    windows_sizes = []
+    if "windows" in platforms:
+        ico_path, windows_sizes = get_windows_ico_path_and_sizes(project_root)
+    all_sizes = {size for _, size, _ in targets} | set(windows_sizes)
+
     if is_svg:
-        # Validate cairosvg is available before doing any work
-        try:
-            import pyvips  # noqa: F401
-        except ImportError:
-            raise RuntimeError(
-                "SVG input requires pyvips. Install it with:\n"
-                "  pip install pyvips"
-            )
-        print("[INFO] SVG input — each icon will be rasterized at its exact target size.")
-        svg_path = master_path
-        img = None
+        # Validate pyvips is available before doing any work
+        _require_pyvips()
+        if svg_exact:
+            print("[INFO] SVG input — each icon will be rasterized at its exact target size.")
+            svg_path = master_path
+            img = None
+        else:
+            # One vector render at the largest icon size, then the same downsampling
+            # pipeline as a PNG master
+            svg_path = None
+            img = None
+            if all_sizes:
+                print(f"[INFO] SVG input — rasterizing once at {MAX_ICON_SIZE}px and downsampling.")
+                img = _svg_to_pil(master_path, MAX_ICON_SIZE)
     else:
-        img = Image.open(master_path).convert("RGBA")
+        img = Image.open(master_path)
+        # Let JPEG decoders downscale by 1/2, 1/4 or 1/8 while decoding, as long as
+        # the result still covers the largest icon. A no-op for PNG and other formats.
+        img.draft("RGB", (MAX_ICON_SIZE, MAX_ICON_SIZE))
+        # Masters without any alpha (JPEG, RGB PNG) are opaque by definition; only
+        # images that can carry transparency pay for an RGBA conversion and scan.
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
         svg_path = None
         w, h = img.size
 
@@ -325,77 +789,131 @@ def generate_icons(master_path: Path, project_root: Path, platforms=None):
             square.paste(img, offset)
             img = square
             w = h = max_dim
-
-    if platforms is None:
-        platforms = DEFAULT_PLATFORMS
-
-    # Platforms whose icons must have no alpha channel (Apple rejects transparency)
-    apple_icon_platforms = {IOS_PLATFORM, "ios-legacy", "watch"}
-
-    # Collect PNG targets for selected platforms, tracking Apple paths separately
-    all_targets = {}
-    no_alpha_paths = set()
-    for platform in platforms:
-        if platform in PLATFORM_GENERATORS:
-            targets = PLATFORM_GENERATORS[platform](project_root)
-            if platform in apple_icon_platforms:
-                no_alpha_paths.update(targets.keys())
-            all_targets.update(targets)
+        elif img.mode == "RGBA" and img.getextrema()[3] == (255, 255):
+            # A fully opaque master carries no information in its alpha channel, so
+            # resize it as RGB and move 3 bytes per pixel through LANCZOS instead of 4
+            img = img.convert("RGB")
 
     # Upscale warning (PNG only — SVG renders crisply at any size)
-    if not is_svg:
-        all_sizes = list(all_targets.values())
-        if "windows" in platforms:
-            _, windows_sizes = get_windows_ico_path_and_sizes(project_root)
-            all_sizes.extend(windows_sizes)
-        if all_sizes:
-            max_target = max(all_sizes)
-            if w < max_target:
-                print(
-                    f"[WARN] Master icon is {w}px, but max target size is {max_target}px. "
-                    f"Upscaling may reduce quality."
-                )
-
-    if all_targets:
-        # Generate platform PNGs
-        for out_path, size in sorted(all_targets.items(), key=lambda kv: kv[1]):
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-
-            if is_svg:
-                resized = _svg_to_pil(svg_path, size)
-            else:
-                resized = img.resize((size, size), Image.LANCZOS)
-
-            # Apple icons must not contain an alpha channel (Apple rejects them)
-            if out_path in no_alpha_paths:
-                resized = _strip_alpha(resized)
-
-            resized.save(out_path, format="PNG")
-            rel = os.path.relpath(out_path, project_root)
-            print(f"[OK] {size}x{size} -> {rel}")
-
-    # Generate Windows multi-size ICO
+    if not is_svg and all_sizes:
+        max_target = max(all_sizes)
+        if w < max_target:
+            print(
+                f"[WARN] Master icon is {w}px, but max target size is {max_target}px. "
+                f"Upscaling may reduce quality."
+            )
+        elif w > MAX_ICON_SIZE:
+            img = _fit_master(img)
+
+    # A tarball is always written in full, so the on-disk cache does not apply
+    if tar_output is not None:
+        use_cache = False
+
+    # Skip outputs that are unchanged since the last run with the same master
+    cache_path = project_root / CACHE_FILENAME
+    cache = _load_cache(cache_path) if use_cache else {}
+    # Entries as loaded, so the cache is only rewritten when a run changed it
+    loaded_cache = {rel: dict(entry) for rel, entry in cache.items()}
+    master_hash = _hash_file(master_path)
+    render_mode = "svg-exact" if svg_path is not None else "raster"
+    rel_paths = {out_path: _relative_to(out_path, project_root) for out_path, _, _ in targets}
+    keys = {
+        out_path: [master_hash, render_mode, size, strip, png_compress_level]
+        for out_path, size, strip in targets
+    }
+    stale = [
+        (out_path, size, strip) for out_path, size, strip in targets
+        if not _is_cached(cache, rel_paths[out_path], out_path, keys[out_path])
+    ]
+    ico_stale = False
     if "windows" in platforms:
-        ico_path, windows_sizes = get_windows_ico_path_and_sizes(project_root)
-        ico_path.parent.mkdir(parents=True, exist_ok=True)
-
-        ico_frames = []
-        for s in windows_sizes:
-            if is_svg:
-                ico_frames.append(_svg_to_pil(svg_path, s))
-            else:
-                ico_frames.append(img.resize((s, s), Image.LANCZOS))
-
-        ico_frames[0].save(
-            ico_path, format="ICO", append_images=ico_frames[1:], sizes=[(s, s) for s in windows_sizes]
-        )
-        rel_ico = os.path.relpath(ico_path, project_root)
-        sizes_str = ", ".join(f"{s}x{s}" for s in windows_sizes)
-        print(f"[OK] ICO ({sizes_str}) -> {rel_ico}")
+        rel_ico = _relative_to(ico_path, project_root)
+        ico_key = [master_hash, render_mode, windows_sizes, ico_bitmap_format]
+        ico_stale = not _is_cached(cache, rel_ico, ico_path, ico_key)
+
+    # Group stale outputs by pixel size so each size is resized and encoded once
+    by_size = defaultdict(list)
+    for out_path, size, strip in stale:
+        by_size[size].append((out_path, strip))
+
+    jobs = []
+    for size in sorted(all_sizes):
+        keep_frame = ico_stale and size in windows_sizes
+        if by_size[size] or keep_frame:
+            jobs.append((size, by_size[size], keep_frame))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if tar_output is None:
+        # Create each output directory once up front rather than once per file
+        out_dirs = {out_path.parent for out_path, _, _ in stale}
+        if ico_stale:
+            out_dirs.add(ico_path.parent)
+        for out_dir in out_dirs:
+            out_dir.mkdir(parents=True, exist_ok=True)
+
+    with _open_tar_output(tar_output) as tar:
+        # Generate platform PNGs, keeping the RGBA frames needed for the ICO
+        ico_images = {}
+        if jobs:
+            results = _run_render_jobs(
+                img,
+                svg_path,
+                jobs,
+                workers,
+                png_compress_level,
+                write_files=tar is None,
+                use_processes=use_processes,
+            )
+            for size, frame, encoded in results:
+                if frame is not None:
+                    ico_images[size] = frame
+                for out_path, strip in by_size[size]:
+                    rel = rel_paths[out_path]
+                    if tar is not None:
+                        _add_to_tar(tar, rel, encoded[strip])
+                    if use_cache:
+                        _record_cache(cache, rel, out_path, keys[out_path])
+                    if not quiet:
+                        print(f"[OK] {size}x{size} -> {rel}")
+
+        # Generate Windows multi-size ICO
+        if ico_stale:
+            # Pillow's ICO writer drops sizes larger than the image it is called on and
+            # resizes any size it cannot find in append_images, so save from the largest
+            # frame and hand it every pre-rendered frame.
+            ico_frames = sorted((ico_images[s] for s in windows_sizes), key=lambda frame: frame.width)
+
+            ico_out = io.BytesIO() if tar is not None else ico_path
+            ico_frames[-1].save(
+                ico_out,
+                format="ICO",
+                append_images=ico_frames[:-1],
+                sizes=[(s, s) for s in windows_sizes],
+                bitmap_format=ico_bitmap_format,
+            )
+            if tar is not None:
+                _add_to_tar(tar, rel_ico, ico_out.getvalue())
+            if use_cache:
+                _record_cache(cache, rel_ico, ico_path, ico_key)
+            sizes_str = ", ".join(f"{s}x{s}" for s in windows_sizes)
+            if not quiet:
+                print(f"[OK] ICO ({sizes_str}) -> {rel_ico}")
+
+    # Only rewrite the cache when an entry was written or re-verified, so a run with
+    # nothing to do (or no targets at all) never touches the project root
+    if use_cache and cache != loaded_cache:
+        _save_cache(cache_path, cache)
 
     # Summary
-    file_count = len(all_targets) + (1 if "windows" in platforms else 0)
+    file_count = len(stale) + (1 if ico_stale else 0)
+    skipped = len(targets) + (1 if "windows" in platforms else 0) - file_count
+    if skipped:
+        print(f"[INFO] {skipped} icon(s) already up to date — skipped (use --no-cache to regenerate).")
     print(f"\nGenerated {file_count} icon(s) for: {', '.join(platforms)}")
+    if tar_output is not None:
+        print(f"[OK] Wrote all icons to {tar_output}")
 
 
 def main():
@@ -417,8 +935,68 @@ def main():
              f"Default: {', '.join(DEFAULT_PLATFORMS)}. "
              f"Optional extras: {', '.join(OPTIONAL_PLATFORMS)}.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of parallel render workers (threads unless --jobs-process). "
+             "Default: number of CPUs. Use 1 to render serially.",
+    )
+    parser.add_argument(
+        "--jobs-process",
+        action="store_true",
+        help="Render in worker processes instead of threads.",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="use_cache",
+        action="store_true",
+        default=True,
+        help=f"Skip icons recorded as up to date in {CACHE_FILENAME} (default).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help=f"Regenerate every icon, ignoring the {CACHE_FILENAME} record of up-to-date outputs.",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only print warnings and the final summary, not a line per generated file.",
+    )
+    parser.add_argument(
+        "--svg-exact",
+        action="store_true",
+        help="SVG input only: rasterize every icon directly from the vector at its exact size "
+             "instead of rendering once at the largest size and downsampling (slower).",
+    )
+    parser.add_argument(
+        "--png-compress-level",
+        type=int,
+        choices=range(10),
+        metavar="{0-9}",
+        help="zlib level for every PNG (0 = none, 9 = smallest files). Default: 1 for icons "
+             f"up to {FAST_PNG_MAX_SIZE}px, 6 above that.",
+    )
+    parser.add_argument(
+        "--tar-output",
+        metavar="PATH",
+        help="Write every icon into a single tar archive at PATH (paths relative to "
+             "project_root) instead of into the project tree.",
+    )
+    parser.add_argument(
+        "--ico-bitmap-format",
+        choices=["png", "bmp"],
+        default="png",
+        help="How frames are stored inside app_icon.ico. png (default) is compact (~35 KB); "
+             "bmp skips PNG compression and writes much faster, but the .ico (which is "
+             "embedded in the Windows executable) grows to ~400 KB.",
+    )
     args = parser.parse_args()
 
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f"--jobs must be at least 1, got {args.jobs}")
+
     master_path = Path(args.master_icon).expanduser().resolve()
     project_root = Path(args.project_root).expanduser().resolve()
 
@@ -429,7 +1007,25 @@ def main():
         if invalid:
             parser.error(f"Unknown platform(s): {', '.join(invalid)}. Choose from: {', '.join(ALL_PLATFORMS)}")
 
-    generate_icons(master_path, project_root, platforms=platforms)
+    tar_output = None
+    if args.tar_output:
+        tar_output = Path(args.tar_output).expanduser().resolve()
+        if tar_output.is_dir():
+            parser.error(f"--tar-output must be a file path, not a directory: {tar_output}")
+
+    generate_icons(
+        master_path,
+        project_root,
+        platforms=platforms,
+        workers=args.jobs,
+        use_cache=args.use_cache,
+        quiet=args.quiet,
+        svg_exact=args.svg_exact,
+        png_compress_level=args.png_compress_level,
+        tar_output=tar_output,
+        ico_bitmap_format=args.ico_bitmap_format,
+        use_processes=args.jobs_process,
+    )
 
 
 if __name__ == "__main__":